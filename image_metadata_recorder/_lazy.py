@@ -0,0 +1,35 @@
+# image_metadata_recorder/_lazy.py
+
+"""Lazy imports for heavy third-party dependencies.
+
+tifffile, xmltodict, and aicspylibczi together add hundreds of milliseconds
+of import time, which ``record_image_metadata --help`` (or a run that only
+touches one format) should not pay. lazy_import() returns a real module
+object whose execution is deferred until the first attribute access, so
+modules can bind them at top level and use plain ``module.attr`` syntax.
+"""
+
+import importlib.util
+import sys
+import types
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Returns the module ``name`` without executing it: execution is deferred
+    by importlib.util.LazyLoader until the first attribute access. If the
+    module is already imported, it is returned as-is. The module must be
+    installed - a missing distribution raises ModuleNotFoundError here, at
+    bind time, just like a normal import would.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}")
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
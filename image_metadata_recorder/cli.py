@@ -9,10 +9,12 @@ the `run_for_file` orchestrator.
 """
 
 import argparse
+import concurrent.futures
 import logging
+import os
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 # Import the main workflow orchestrator
 from image_metadata_recorder.workflow import workflow
@@ -20,6 +22,9 @@ from image_metadata_recorder.workflow import workflow
 # Supported file extensions (case-insensitive for matching)
 SUPPORTED_EXTENSIONS = [".tiff", ".tif", ".qptiff", ".czi"]
 
+# Frozen set for O(1) membership tests, built once at import time.
+_SUPPORTED_EXT_SET = frozenset(SUPPORTED_EXTENSIONS)
+
 
 def setup_logging(log_level_str: str = "INFO") -> None:
     """Configures basic logging for the application."""
@@ -51,7 +56,7 @@ def find_files(target_path_str: str) -> List[Path]:
         return found_files
 
     if target_path.is_file():
-        if target_path.suffix.lower() in SUPPORTED_EXTENSIONS:
+        if target_path.suffix.lower() in _SUPPORTED_EXT_SET:
             found_files.append(target_path.resolve())
         else:
             logging.warning(
@@ -60,20 +65,24 @@ def find_files(target_path_str: str) -> List[Path]:
             )
     elif target_path.is_dir():
         logging.info(f"Scanning directory: {target_path_str} for supported files...")
-        for ext in SUPPORTED_EXTENSIONS:
-            # Search for both lowercase and uppercase extensions if OS is case-sensitive
-            found_files.extend(target_path.glob(f"*{ext}"))
-            if ext.lower() != ext.upper():  # e.g. for .tif vs .TIF
-                found_files.extend(target_path.glob(f"*{ext.upper()}"))
-
-        # Resolve paths and filter unique files in case of case-insensitive globbing on some systems
-        # or duplicate patterns (e.g. .tif and .tiff potentially matching same files)
-        unique_resolved_files = sorted(list(set(f.resolve() for f in found_files)))
-
-        # Final filter by suffix just to be sure glob didn't pick up something odd
-        found_files = [
-            f for f in unique_resolved_files if f.suffix.lower() in SUPPORTED_EXTENSIONS
-        ]
+        # A single os.scandir pass replaces the previous per-extension glob
+        # fan-out (one directory read per extension and case variant), which
+        # re-statted the directory up to 8 times on large folders. is_file()
+        # follows symlinks (as the glob path did): regular files still answer
+        # from scandir's cached type, only symlink entries pay a stat.
+        with os.scandir(target_path) as dir_entries:
+            candidate_paths = [
+                entry.path
+                for entry in dir_entries
+                if entry.is_file()
+                and os.path.splitext(entry.name)[1].lower() in _SUPPORTED_EXT_SET
+            ]
+        # Deduplicate on the raw path string first so each unique file pays
+        # for exactly one resolve() (a realpath syscall); resolving before
+        # deduplication would do that work for duplicates as well.
+        found_files = sorted(
+            Path(p).resolve() for p in dict.fromkeys(candidate_paths)
+        )
 
         logging.info(f"Found {len(found_files)} supported files in {target_path_str}.")
     else:
@@ -82,6 +91,49 @@ def find_files(target_path_str: str) -> List[Path]:
     return found_files
 
 
+def _process_one(
+    filepath_str: str,
+    output_dir_str: str,
+    log_level_str: str = "INFO",
+    use_extraction_cache: bool = True,
+    force_overwrite: bool = False,
+) -> Tuple[str, bool, Optional[str]]:
+    """
+    Processes a single file via the workflow orchestrator.
+
+    Module-level (picklable) so it can be submitted to a ProcessPoolExecutor.
+    Returns a (filename, success, error_message) tuple; worker processes have
+    their own logging configured here since handlers are not inherited.
+
+    Args:
+        filepath_str: Absolute path to the image file.
+        output_dir_str: Absolute path to the output directory.
+        log_level_str: Logging level name to configure in the worker.
+
+    Returns:
+        A tuple of (file name, success flag, error message or None).
+    """
+    if not logging.getLogger().hasHandlers():
+        setup_logging(log_level_str)
+    file_name = Path(filepath_str).name
+    logging.info(f"--- Starting processing for: {file_name} ---")
+    try:
+        workflow.run_for_file(
+            filepath_str=filepath_str,
+            output_dir_str=output_dir_str,
+            use_extraction_cache=use_extraction_cache,
+            force_overwrite=force_overwrite,
+        )
+        logging.info(f"--- Finished processing for: {file_name} ---")
+        return (file_name, True, None)
+    except Exception as e:
+        logging.error(
+            f"!!! Critical error during workflow for {file_name}: {e} !!!",
+            exc_info=True,  # Print stack trace for unexpected errors at this level
+        )
+        return (file_name, False, str(e))
+
+
 def main() -> None:
     """
     Main entry point for the image-metadata-recorder CLI.
@@ -102,6 +154,16 @@ def main() -> None:
         default="metadata_output",
         help="Directory to save output files (default: 'metadata_output' in current dir).",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the on-disk extraction cache and always re-extract metadata.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate outputs even when they are newer than the input file.",
+    )
     parser.add_argument(
         "--log-level",
         type=str,
@@ -134,30 +196,52 @@ def main() -> None:
 
     success_count = 0
     failure_count = 0
+    output_dir_str = str(output_directory.resolve())
 
-    for image_file_path in files_to_process:
-        logging.info(f"--- Starting processing for: {image_file_path.name} ---")
-        try:
-            # Ensure file path is absolute string for run_for_file
-            workflow.run_for_file(
-                filepath_str=str(image_file_path.resolve()),
-                output_dir_str=str(output_directory.resolve()),
+    # Files are independent of each other, so batches are fanned out across a
+    # process pool (extraction is I/O plus CPU-bound XML parsing). A single
+    # file is processed in-process to avoid pool start-up overhead.
+    results: List[Tuple[str, bool, Optional[str]]] = []
+    use_extraction_cache = not args.no_cache
+    if len(files_to_process) == 1:
+        results.append(
+            _process_one(
+                str(files_to_process[0].resolve()),
+                output_dir_str,
+                args.log_level,
+                use_extraction_cache,
+                args.force,
             )
-            logging.info(f"--- Finished processing for: {image_file_path.name} ---")
+        )
+    else:
+        max_workers = min(os.cpu_count() or 1, len(files_to_process))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as ex:
+            futures = {
+                ex.submit(
+                    _process_one,
+                    str(p.resolve()),
+                    output_dir_str,
+                    args.log_level,
+                    use_extraction_cache,
+                    args.force,
+                ): p
+                for p in files_to_process
+            }
+            for fut in concurrent.futures.as_completed(futures):
+                results.append(fut.result())
+
+    for file_name, ok, error_message in results:
+        if ok:
             success_count += 1
-        except Exception as e:
-            logging.error(
-                f"!!! Critical error during workflow for {image_file_path.name}: {e} !!!",
-                exc_info=True,  # Print stack trace for unexpected errors at this level
+            continue
+        failure_count += 1
+        # Optionally, create a specific error file for this top-level failure
+        error_file = output_directory / f"{Path(file_name).stem}_WORKFLOW_ERROR.txt"
+        with open(error_file, "w") as f_err:
+            f_err.write(
+                f"A critical error occurred processing {file_name}:\n{error_message}\n"
             )
-            failure_count += 1
-            # Optionally, create a specific error file for this top-level failure
-            error_file = output_directory / f"{image_file_path.stem}_WORKFLOW_ERROR.txt"
-            with open(error_file, "w") as f_err:
-                f_err.write(
-                    f"A critical error occurred processing {image_file_path.name}:\n{e}\n"
-                )
-                f_err.write("Check logs for more details.")
+            f_err.write("Check logs for more details.")
 
     logging.info("\n===================================================")
     logging.info("              Batch Processing Complete!             ")
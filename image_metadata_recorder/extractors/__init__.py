@@ -1,10 +1,11 @@
+import functools
+import importlib
 import logging
-from typing import Callable, Dict, Optional, Any
+import sys
+from typing import Callable, Dict, Optional, Any, Set, Tuple
+from importlib.metadata import EntryPoint
 from importlib.metadata import entry_points as iter_entry_points  # Renamed for clarity
 
-# Import built-in extractors
-from . import tiff_extractor, czi_extractor
-
 # Import WorkflowContext for type hinting Callable argument
 from image_metadata_recorder.workflow.context import WorkflowContext
 
@@ -13,89 +14,114 @@ logger = logging.getLogger(__name__)
 # Define the new signature for extractor functions
 ExtractorCallable = Callable[[WorkflowContext], Dict[str, Any]]
 
-# Initialize with built-in extractors
-# These are always available. Plugins can add to this or override if names clash (last one loaded wins for a given key).
+# Built-in extractors as (module, attribute) specs. The extractor modules pull
+# in heavy third-party dependencies (tifffile, aicspylibczi), so they are only
+# imported when their extension is actually requested - a CLI run over TIFFs
+# never pays the aicspylibczi import, and vice versa.
 # Keys are file extensions (lowercase, with leading dot).
-_BUILTIN_EXTRACTORS: Dict[str, ExtractorCallable] = {
-    ".tiff": tiff_extractor.extract,
-    ".tif": tiff_extractor.extract,
-    ".qptiff": tiff_extractor.extract,
-    ".czi": czi_extractor.extract,
+_BUILTIN_EXTRACTOR_SPECS: Dict[str, Tuple[str, str]] = {
+    ".tiff": ("image_metadata_recorder.extractors.tiff_extractor", "extract"),
+    ".tif": ("image_metadata_recorder.extractors.tiff_extractor", "extract"),
+    ".qptiff": ("image_metadata_recorder.extractors.tiff_extractor", "extract"),
+    ".czi": ("image_metadata_recorder.extractors.czi_extractor", "extract"),
 }
 
-# Global registry that will be populated once
-_EXTRACTOR_REGISTRY: Optional[Dict[str, ExtractorCallable]] = None
+# Extensions whose plugin entry point has already been loaded (or attempted),
+# so each plugin pays its import cost at most once.
+_LOADED_PLUGIN_EXTS: Set[str] = set()
+
+# Description strings for inspection, seeded from the built-in specs, then
+# from the discovered plugin entry points, and updated whenever a plugin is
+# actually loaded, so get_registered_extractors is a plain dict copy with no
+# per-call attribute reads or formatting.
+_REGISTRY_DESC: Dict[str, str] = {
+    ext: f"{module_name}.{attr_name}"
+    for ext, (module_name, attr_name) in _BUILTIN_EXTRACTOR_SPECS.items()
+}
 
 
-def _load_extractors() -> Dict[str, ExtractorCallable]:
+@functools.lru_cache(maxsize=1)
+def _get_plugin_entry_points() -> Dict[str, EntryPoint]:
     """
-    Loads extractors from entry points and merges them with built-in extractors.
-    This function should ideally be called only once.
+    Scans the plugin entry-point group exactly once and returns a mapping of
+    file extension -> entry point. Scanning importlib.metadata re-parses the
+    metadata of every installed distribution, so the result is cached; the
+    actual (potentially heavy) plugin imports are deferred until an extension
+    is first requested.
+    """
+    discovered: Dict[str, EntryPoint] = {}
+    for entry_point in iter_entry_points(group="image_metadata_recorder.extractors"):
+        logger.debug(
+            f"Found plugin entry point: {entry_point.name} from {entry_point.value}"
+        )
+        # Adopting Option 1 for now as per the plan's simplicity: entry_point.name is the extension.
+        if not entry_point.name.startswith("."):
+            logger.warning(
+                f"Extractor plugin '{entry_point.name}' from '{entry_point.value}' "
+                f"uses an entry point name that does not start with a dot. "
+                f"Assuming it's a descriptive name, not the file extension. Plugin will not be registered by name. "
+                f"The plugin itself must register extensions if this is the case, or use the extension as the entry point name."
+            )
+            continue
+        discovered[entry_point.name.lower()] = entry_point
+    # Seed the description cache with the declared entry-point targets
+    # (EntryPoint.value, available without importing anything) so the
+    # inspection API lists discovered-but-not-yet-loaded plugins; actually
+    # loading a plugin refines its entry to the resolved callable's path.
+    for extension, entry_point in discovered.items():
+        _REGISTRY_DESC[extension] = entry_point.value
+    return discovered
+
+
+@functools.lru_cache(maxsize=1)
+def _get_registry() -> Dict[str, ExtractorCallable]:
+    """
+    Returns the live extractor registry of resolved callables. lru_cache
+    guarantees the dict is built exactly once; built-ins and lazily loaded
+    plugins are inserted into it as their extensions are first requested.
     """
-    global _EXTRACTOR_REGISTRY
-    if _EXTRACTOR_REGISTRY is not None:
-        return _EXTRACTOR_REGISTRY
-
     logger.info("Initializing extractor registry...")
-    # Start with built-in extractors
-    # Make a copy to avoid modifying the original _BUILTIN_EXTRACTORS dict if loaded multiple times by mistake
-    loaded_registry: Dict[str, ExtractorCallable] = _BUILTIN_EXTRACTORS.copy()
+    return {}
 
-    logger.debug(f"Built-in extractors registered: {list(loaded_registry.keys())}")
 
-    # Discover and load plugins from the entry point group
-    discovered_plugins = iter_entry_points(group="image_metadata_recorder.extractors")
-
-    for entry_point in discovered_plugins:
-        try:
-            logger.debug(
-                f"Found plugin entry point: {entry_point.name} from {entry_point.value}"
-            )
-            loaded_plugin_module = (
-                entry_point.load()
-            )  # This loads the callable (e.g., an 'extract' function)
-
-            # Adopting Option 1 for now as per the plan's simplicity: entry_point.name is the extension.
-            file_extension_from_plugin_name = entry_point.name
-            if not file_extension_from_plugin_name.startswith("."):
-                logger.warning(
-                    f"Extractor plugin '{entry_point.name}' from '{entry_point.module_name}' "
-                    f"uses an entry point name that does not start with a dot. "
-                    f"Assuming it's a descriptive name, not the file extension. Plugin will not be registered by name. "
-                    f"The plugin itself must register extensions if this is the case, or use the extension as the entry point name."
-                )
-                continue
-
-            if not callable(loaded_plugin_module):
-                logger.warning(
-                    f"Plugin {entry_point.name} from {entry_point.module_name} "
-                    f"did not load a callable function. Loaded: {type(loaded_plugin_module)}. Skipping."
-                )
-                continue
-
-            normalized_extension = file_extension_from_plugin_name.lower()
-            if normalized_extension in loaded_registry:
-                logger.warning(
-                    f"Plugin '{entry_point.name}' (from {entry_point.module_name}) "
-                    f"is overriding the extractor for extension '{normalized_extension}'."
-                )
-
-            loaded_registry[normalized_extension] = loaded_plugin_module
-            logger.info(
-                f"Successfully loaded and registered extractor plugin for '{normalized_extension}' from {entry_point.module_name}."
+def _load_plugin_for_extension(normalized_extension: str) -> None:
+    """
+    Loads the plugin entry point registered for the given extension, if any,
+    and inserts it into the registry. Called at most once per extension.
+    """
+    entry_point = _get_plugin_entry_points().get(normalized_extension)
+    if entry_point is None:
+        return
+    try:
+        loaded_plugin = entry_point.load()
+        if not callable(loaded_plugin):
+            logger.warning(
+                f"Plugin {entry_point.name} from {entry_point.value} "
+                f"did not load a callable function. Loaded: {type(loaded_plugin)}. Skipping."
             )
-
-        except Exception as e:
-            logger.error(
-                f"Failed to load extractor plugin '{entry_point.name}': {e}",
-                exc_info=True,
+            return
+
+        registry = _get_registry()
+        if (
+            normalized_extension in registry
+            or normalized_extension in _BUILTIN_EXTRACTOR_SPECS
+        ):
+            logger.warning(
+                f"Plugin '{entry_point.name}' (from {entry_point.value}) "
+                f"is overriding the extractor for extension '{normalized_extension}'."
             )
-
-    _EXTRACTOR_REGISTRY = loaded_registry
-    logger.info(
-        f"Extractor registry fully initialized. Total extractors: {len(_EXTRACTOR_REGISTRY)}. Keys: {list(_EXTRACTOR_REGISTRY.keys())}"
-    )
-    return _EXTRACTOR_REGISTRY
+        registry[normalized_extension] = loaded_plugin
+        _REGISTRY_DESC[normalized_extension] = (
+            f"{loaded_plugin.__module__}.{loaded_plugin.__name__}"
+        )
+        logger.info(
+            f"Successfully loaded and registered extractor plugin for '{normalized_extension}' from {entry_point.value}."
+        )
+    except Exception as e:
+        logger.error(
+            f"Failed to load extractor plugin '{entry_point.name}': {e}",
+            exc_info=True,
+        )
 
 
 def get_extractor(file_extension: str) -> Optional[ExtractorCallable]:
@@ -112,23 +138,66 @@ def get_extractor(file_extension: str) -> Optional[ExtractorCallable]:
         dictionary of extracted metadata, or None if no extractor is found
         for the given extension.
     """
-    # Ensure registry is loaded
-    if _EXTRACTOR_REGISTRY is None:
-        _load_extractors()  # Load on first call
+    normalized_extension = file_extension.lower() if file_extension else ""
+    # Plugins win over built-ins for the same extension (as before), but each
+    # plugin import only happens on the first request for its extension.
+    if normalized_extension not in _LOADED_PLUGIN_EXTS:
+        _LOADED_PLUGIN_EXTS.add(normalized_extension)
+        _load_plugin_for_extension(normalized_extension)
+
+    registry = _get_registry()
+    extractor = registry.get(normalized_extension)
+    if extractor is None:
+        spec = _BUILTIN_EXTRACTOR_SPECS.get(normalized_extension)
+        if spec is not None:
+            module_name, attr_name = spec
+            extractor = getattr(importlib.import_module(module_name), attr_name)
+            registry[normalized_extension] = extractor
+    return extractor
+
+
+# Batch extractor functions take a list of contexts and return results in
+# input order.
+BatchExtractorCallable = Callable[[list], list]
+
+
+def get_batch_extractor(file_extension: str) -> Optional[BatchExtractorCallable]:
+    """
+    Retrieves a batch extractor for the given extension: the extractor
+    module's batch_extract (which fans out across a process pool) when it
+    defines one, otherwise a sequential wrapper around the single-file
+    extractor. Returns None if no extractor is registered for the extension.
+    """
+    extractor = get_extractor(file_extension)
+    if extractor is None:
+        return None
+
+    batch = getattr(sys.modules.get(extractor.__module__), "batch_extract", None)
+    if callable(batch):
+        return batch
 
-    current_registry = _EXTRACTOR_REGISTRY if _EXTRACTOR_REGISTRY is not None else {}
+    def _sequential_batch(contexts: list) -> list:
+        return [extractor(ctx) for ctx in contexts]
 
-    return current_registry.get(file_extension.lower())
+    return _sequential_batch
 
 
-# Optional: function to force reload or inspect registry
+# Optional: function to inspect the registry
 def get_registered_extractors() -> Dict[str, str]:
     """Returns a dictionary of registered extensions and their module source for inspection."""
-    if _EXTRACTOR_REGISTRY is None:
-        _load_extractors()
-
-    desc = {}
-    if _EXTRACTOR_REGISTRY:
-        for ext, func in _EXTRACTOR_REGISTRY.items():
-            desc[ext] = f"{func.__module__}.{func.__name__}"
-    return desc
+    # The entry-point scan seeds the description cache with discovered
+    # plugins; it is lru_cached, so after the first call this line is a
+    # plain cache hit. The copy itself involves no attribute reads,
+    # formatting, or heavy imports.
+    _get_plugin_entry_points()
+    return dict(_REGISTRY_DESC)
+
+
+# Eager initialization at package import: the registry dict and the plugin
+# entry-point scan (which re-parses installed distribution metadata) are paid
+# once at startup rather than inside the first file's processing path, so
+# every subsequent lookup is a plain dict access. Built-in extractor modules
+# still resolve on first use - their heavy imports are only needed when their
+# extension is actually extracted.
+_get_registry()
+_get_plugin_entry_points()
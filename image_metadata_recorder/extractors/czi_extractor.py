@@ -5,18 +5,83 @@ CZI metadata extraction module.
 """
 
 import logging
-from typing import Any, Dict
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Union
 from xml.etree import ElementTree
 
-import xmltodict
-from aicspylibczi import CziFile
+from image_metadata_recorder._lazy import lazy_import
+from image_metadata_recorder.extractors.xml_util import coerce_scalar
 from image_metadata_recorder.workflow.context import WorkflowContext
 
+# aicspylibczi is a large C extension; the lazy proxy defers its actual
+# import to the first attribute access, so TIFF-only runs (and --help) never
+# pay the cost.
+aicspylibczi = lazy_import("aicspylibczi")
+
 # ---------------------- Logging Setup ---------------------- #
 
 # Module-level logger can be kept for general module info
 logger = logging.getLogger(__name__)
 
+# ---------------------- Helper Functions ---------------------- #
+
+
+def _elem_to_dict(elem: ElementTree.Element) -> Union[Dict[str, Any], Any]:
+    """
+    Converts an ElementTree element to the same nested dict shape xmltodict
+    produces ('@attr' keys, '#text' for mixed content, lists for repeated
+    child tags), walking the already-parsed tree directly. This avoids the
+    previous serialize-to-string plus full re-parse round trip on the
+    multi-MB metadata blocks aicspylibczi hands back.
+    """
+    result: Dict[str, Any] = {}
+    for attr_name, attr_value in elem.attrib.items():
+        result["@" + attr_name] = coerce_scalar(attr_value)
+
+    for child in elem:
+        child_value = _elem_to_dict(child)
+        tag = child.tag
+        if tag in result:
+            existing = result[tag]
+            if isinstance(existing, list):
+                existing.append(child_value)
+            else:
+                result[tag] = [existing, child_value]
+        else:
+            result[tag] = child_value
+
+    text = elem.text.strip() if elem.text else ""
+    if text:
+        if result:
+            result["#text"] = coerce_scalar(text)
+        else:
+            return coerce_scalar(text)
+    return result if result else None
+
+
+def _raw_meta_xml(czi: Any) -> Optional[str]:
+    """
+    Returns the raw metadata XML string straight from the CZI reader when the
+    installed aicspylibczi exposes it (newer versions do, under
+    meta_xml_string or reader.read_meta()); None otherwise. Using the raw
+    string skips re-serializing the multi-MB Element tree.
+    """
+    raw = getattr(czi, "meta_xml_string", None)
+    if raw is None:
+        read_meta = getattr(getattr(czi, "reader", None), "read_meta", None)
+        if callable(read_meta):
+            try:
+                raw = read_meta()
+            except Exception:
+                return None
+    if isinstance(raw, bytes):
+        return raw.decode("utf-8", errors="replace")
+    if isinstance(raw, str):
+        return raw
+    return None
+
+
 # ---------------------- CZI Extractor ---------------------- #
 
 
@@ -42,7 +107,7 @@ def extract(context: WorkflowContext) -> Dict[str, Any]:
     try:
         # Use context.logger for operational messages
         context.logger.debug(f"Attempting to open CZI file: {czi_file_path_str}")
-        czi = CziFile(czi_file_path_str)
+        czi = aicspylibczi.CziFile(czi_file_path_str)
 
         xml_metadata_element = czi.meta
         if xml_metadata_element is None:
@@ -60,40 +125,29 @@ def extract(context: WorkflowContext) -> Dict[str, Any]:
                 )
             return raw_metadata
 
-        xml_string = ElementTree.tostring(xml_metadata_element, encoding="unicode")
+        # The string is needed solely for the raw-metadata JSON artifact; the
+        # structured dict below comes from walking the Element directly, so
+        # it is never re-parsed. Newer aicspylibczi versions hand back the
+        # raw XML directly; otherwise serialize the Element once
+        # (encoding='unicode' yields the str the JSON serializer needs
+        # without a bytes round-trip).
+        xml_string = _raw_meta_xml(czi)
+        if xml_string is None:
+            xml_string = ElementTree.tostring(
+                xml_metadata_element, encoding="unicode"
+            )
         raw_metadata["xml_metadata_string"] = xml_string
 
-        # Parse the XML string to a dictionary
-        # The postprocessor and xmltodict.parse don't use logging directly here,
-        # so they don't need context passed in unless we modify them, which is out of scope.
-        # process_namespaces=True helps in correctly parsing namespaced XML like CZI's
-        # Might need a custom postprocessor if numbers/booleans are not parsed correctly
-        def postprocessor(_, key, val):
-            if val is None or not isinstance(val, str):
-                return key, val
-            if val.lower() in {"true", "false"}:
-                return key, val.lower() == "true"
-            try:
-                if "." in val or "e" in val.lower():  # Heuristic for float
-                    return key, float(val)
-                elif val.lstrip("-+").isdigit():  # Check if it's an integer
-                    return key, int(val)
-            except ValueError:
-                pass  # Keep as string if conversion fails
-            return key, val
-
-        parsed_xml = xmltodict.parse(
-            xml_string,
-            process_namespaces=True,
-            namespaces={
-            },
-            postprocessor=postprocessor,
-        )
-
-        # The root of CZI metadata is often <ImageDocument> or similar.
-        # xmltodict will create a dict with this root as the single key.
-        # We can simplify this if the root key is predictable or just store as is.
-        raw_metadata["structured_metadata"] = parsed_xml
+        # Walk the Element aicspylibczi already parsed instead of re-parsing
+        # the serialized string. The root of CZI metadata is often
+        # <ImageDocument> or similar; mirroring xmltodict, the result is a
+        # dict with that root tag as the single key. Skipped entirely when
+        # the caller only needs the raw XML string preserved.
+        if context.parse_xml:
+            parsed_xml = {
+                xml_metadata_element.tag: _elem_to_dict(xml_metadata_element)
+            }
+            raw_metadata["structured_metadata"] = parsed_xml
 
     except FileNotFoundError:
         context.logger.error(f"CZI file not found: {czi_file_path_str}")
@@ -106,3 +160,18 @@ def extract(context: WorkflowContext) -> Dict[str, Any]:
         raw_metadata["error"] = str(e)
 
     return raw_metadata
+
+
+def batch_extract(contexts: List[WorkflowContext]) -> List[Dict[str, Any]]:
+    """
+    Extracts metadata for many files by fanning extract() out across a
+    process pool; the Element-tree walk is CPU-bound Python, so parallelism
+    needs separate processes. WorkflowContext pickles cleanly (loggers
+    reduce to their names). Results come back in input order.
+    """
+    if len(contexts) <= 1:
+        # Pool startup would dominate a single extraction.
+        return [extract(ctx) for ctx in contexts]
+    max_workers = min(os.cpu_count() or 1, len(contexts))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(extract, contexts))
@@ -6,13 +6,23 @@ TIFF metadata extraction module.
 
 import json
 import logging
-import re
-from typing import Any, Dict, Optional, Union
-
-import xmltodict
-from tifffile import TiffFile, TiffPage
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+
+from image_metadata_recorder._lazy import lazy_import
+from image_metadata_recorder.extractors.xml_util import (
+    coerce_leaves,
+    parse_xml_to_dict,
+)
 from image_metadata_recorder.workflow.context import WorkflowContext
 
+# tifffile is heavy; the lazy proxy defers its actual import to the first
+# attribute access, so `record_image_metadata --help` (and CZI-only runs)
+# never pay the cost while extract() keeps plain module.attr syntax.
+tifffile = lazy_import("tifffile")
+
 # ---------------------- Logging Setup ---------------------- #
 
 # Module-level logger is fine, but operations might use context.logger
@@ -20,22 +30,68 @@ logger = logging.getLogger(__name__)
 
 # ---------------------- Constants ---------------------- #
 
-COMMON_ENCODINGS = ["utf-16", "utf-8", "latin1"]
+# Only tags whose names contain one of these tokens realistically hold XML;
+# all other byte-valued tags (strip offsets, ICC profiles, ...) skip the
+# decode-as-XML attempt entirely. "xmp" covers tag 700 (XMP), whose value is
+# an XML packet.
+_XML_CANDIDATE_TOKENS = ("description", "xml", "xmp", "metadata", "comment")
+
+# Exact-type groups for the per-tag dispatch in extract(): a single type()
+# lookup plus a 2-tuple membership test replaces chained isinstance calls in
+# the hot loop (tag_count x page_count invocations on large QPTIFFs).
+# Container values are safe to dispatch by exact type (tifffile hands back
+# plain lists/tuples), but their elements are not: enum-typed tags like
+# ExtraSamples hold IntEnum members, so element tests must stay isinstance.
+_SEQ_TYPES = (list, tuple)
+_NUM_TYPES = (int, float)
+
+# Tag code -> name memo. TiffTag.name is a property that resolves the code
+# through tifffile's registry on every access; the mapping is static, so one
+# dict hit replaces the property dispatch for every repeated tag across
+# pages and files. (TiffTags.items() can't replace this: it is keyed by the
+# numeric code, not the name.)
+_TAG_NAME_CACHE: Dict[int, str] = {}
 
 # ---------------------- Helper Functions ---------------------- #
 
 
 def _try_decode(value: bytes) -> Optional[str]:
-    """Attempt to decode a byte string using common encodings."""
-    for enc in COMMON_ENCODINGS:
+    """
+    Attempt to decode a byte string, sniffing the encoding from the leading
+    bytes. The old approach always tried UTF-16 first, paying a full (and
+    almost always wrong) decode of every large binary tag value; UTF-16 is
+    now only attempted when a BOM or interleaved-null XML prefix is present.
+    """
+    if not value:
+        return None
+
+    head = value[:4]
+    # UTF-16 BOM, or BOM-less UTF-16 XML ('<?' with interleaved nulls).
+    if head[:2] in (b"\xff\xfe", b"\xfe\xff") or head in (
+        b"<\x00?\x00",
+        b"\x00<\x00?",
+    ):
         try:
-            decoded = value.decode(enc)
-            # Be more specific for XML detection if possible
-            if "<?xml" in decoded.lower():  # Check for XML declaration
-                return decoded
+            decoded = value.decode("utf-16")
+        except UnicodeDecodeError:
+            return None
+        return decoded if "<?xml" in decoded.lower() else None
+
+    # Pure-ASCII fast path: typical ImageDescription blobs are ASCII XML,
+    # and isascii() is a single C-level scan that lets them skip straight
+    # to the trivial ASCII decoder.
+    if value.isascii():
+        return value.decode("ascii")
+
+    # Everything else: UTF-8 covers the BOM'd form and multibyte text, with
+    # latin1 and lossy UTF-8 as last resorts (matching the previous fallback).
+    if head[:3] == b"\xef\xbb\xbf":
+        value = value[3:]
+    for enc in ("utf-8", "latin1"):
+        try:
+            return value.decode(enc)
         except UnicodeDecodeError:
             continue
-    # Fallback if no XML declaration found but might still be XML-like
     try:
         return value.decode(
             "utf-8", errors="replace"
@@ -45,48 +101,30 @@ def _try_decode(value: bytes) -> Optional[str]:
 
 
 def _parse_generic_xml(xml_input: Union[str, bytes]) -> Optional[Dict[str, Any]]:
-    """Parse XML string or bytes into a dictionary using xmltodict."""
+    """Parse XML string or bytes into a dictionary (lxml when available)."""
     if isinstance(xml_input, bytes):
         xml_input = _try_decode(xml_input)
 
     if not xml_input or not isinstance(xml_input, str) or not xml_input.strip():
         return None
 
-    # More robust check for actual XML content
-    if not xml_input.strip().startswith("<"):
+    # Locate the document start with str.find - a single C-level scan, no
+    # regex VM. Only leading whitespace may precede the first '<' (same
+    # acceptance as before); a leading '<!--' comment is a valid document
+    # start for the parser, so it no longer needs skipping.
+    idx = xml_input.find("<")
+    if idx < 0:
         return None
-
-    # Attempt to find the start of the XML content if prefixed with junk
-    match = re.search(r"<(?!!--)", xml_input)
-    if not match:
+    if xml_input[:idx].strip():
         return None
-    clean_xml = xml_input[match.start() :]
-
-    def postprocessor(_, key, val):
-        if val is None or not isinstance(val, str):
-            return key, val
-        if val.lower() in {"true", "false"}:
-            return key, val.lower() == "true"
-        # Handle potential errors with int/float conversion
-        try:
-            if "." in val or "e" in val.lower():  # Heuristic for float
-                return key, float(val)
-            elif val.lstrip(
-                "-+"
-            ).isdigit():  # Check if it's an integer (positive or negative)
-                return key, int(val)
-        except ValueError:
-            pass  # Keep as string if conversion fails
-        return key, val
+    clean_xml = xml_input if idx == 0 else xml_input[idx:]
 
     try:
-        # Disable namespace processing if it causes issues, or handle specific namespaces
-        return xmltodict.parse(
-            clean_xml,
-            process_namespaces=False,  # Changed to False for broader compatibility
-            namespaces=None,  # Explicitly no specific namespace mapping
-            postprocessor=postprocessor,
-        )
+        # parse_xml_to_dict uses lxml's C parser when installed and falls
+        # back to xmltodict (no postprocessor: the per-element Python
+        # callback fired once per element and attribute, which dominates on
+        # large OME-XML). One bulk pass coerces all string leaves afterwards.
+        return coerce_leaves(parse_xml_to_dict(clean_xml))
     except Exception as e:
         logger.warning(
             "Failed to parse XML: %s. XML content: %s", e, clean_xml[:200]
@@ -94,34 +132,6 @@ def _parse_generic_xml(xml_input: Union[str, bytes]) -> Optional[Dict[str, Any]]
         return None
 
 
-def _find_xml_description_in_tags(page: TiffPage) -> Optional[str]:
-    """Find XML content from the description or known XML-style tags."""
-
-    def process_value(val: Any) -> Optional[str]:
-        if isinstance(val, bytes):
-            decoded_val = _try_decode(val)
-            # Ensure what's returned is actually XML-like
-            if decoded_val and decoded_val.strip().startswith("<"):
-                return decoded_val
-            return None  # Return None if not XML-like
-        if isinstance(val, str) and val.strip().startswith("<"):
-            return val
-        return None
-
-    # Prioritize ImageDescription tag as it's standard for OME-XML etc.
-    if page.tags.get("ImageDescription"):
-        xml_str = process_value(page.tags["ImageDescription"].value)
-        if xml_str:
-            return xml_str
-
-    # Fallback to page.description (less common for primary XML)
-    xml_str_desc = process_value(getattr(page, "description", None))
-    if xml_str_desc:
-        return xml_str_desc
-
-    return None
-
-
 def _parse_perkinelmer_xml(xml_string: str) -> Dict[str, Any]:
     """Parse PerkinElmer-specific XML that may contain embedded JSON."""
     try:
@@ -132,19 +142,24 @@ def _parse_perkinelmer_xml(xml_string: str) -> Dict[str, Any]:
 
         # We need to find ScanProfile
         # This part needs to be robust to different XML structures.
+        # Iterative BFS: no per-node Python frame, and shallow matches (the
+        # common case for ScanProfile) are found before deep subtrees are
+        # walked.
         def find_key(data, target_key):
-            if isinstance(data, dict):
-                if target_key in data:
-                    return data[target_key]
-                for k, v in data.items():
-                    found = find_key(v, target_key)
-                    if found:
-                        return found
-            elif isinstance(data, list):
-                for item in data:
-                    found = find_key(item, target_key)
-                    if found:
-                        return found
+            queue = deque([data])
+            queue_extend = queue.extend
+            while queue:
+                node = queue.popleft()
+                if isinstance(node, dict):
+                    if target_key in node:
+                        return node[target_key]
+                    queue_extend(
+                        v for v in node.values() if isinstance(v, (dict, list))
+                    )
+                elif isinstance(node, list):
+                    queue_extend(
+                        item for item in node if isinstance(item, (dict, list))
+                    )
             return None
 
         scan_profile_val = find_key(parsed, "ScanProfile")
@@ -202,19 +217,30 @@ def extract(context: WorkflowContext) -> Dict[str, Any]:
 
     raw_metadata: Dict[str, Any] = {"source_file_path": tiff_file_path_str, "pages": []}
     top_level_tags = {}
+    # Raw XML strings are always preserved; the XML-to-dict conversion (the
+    # expensive part on multi-MB metadata) is skipped when the caller only
+    # needs the raw strings.
+    parse_xml = context.parse_xml
 
     try:
-        with TiffFile(tiff_file_path_str) as tif:
-            if tif.ome_metadata:
-                top_level_tags["ome_xml_string"] = tif.ome_metadata
-                parsed_ome = _parse_generic_xml(
-                    tif.ome_metadata
-                )  # Uses module logger for XML parsing warnings
-                if parsed_ome:
-                    top_level_tags["structured_ome_metadata"] = parsed_ome
-
-            if tif.imagej_metadata:
-                top_level_tags["imagej_metadata"] = tif.imagej_metadata
+        with tifffile.TiffFile(tiff_file_path_str) as tif:
+            # Bind the properties once; tifffile recomputes them per access.
+            ome_metadata = tif.ome_metadata
+            if ome_metadata:
+                top_level_tags["ome_xml_string"] = ome_metadata
+                # Only re-parse values that are actually XML text; tifffile
+                # may already hand back structured data for some fields.
+                if parse_xml and isinstance(ome_metadata, (str, bytes)):
+                    parsed_ome = _parse_generic_xml(
+                        ome_metadata
+                    )  # Uses module logger for XML parsing warnings
+                    if parsed_ome:
+                        top_level_tags["structured_ome_metadata"] = parsed_ome
+
+            imagej_metadata = tif.imagej_metadata
+            if imagej_metadata:
+                # Already a dict from tifffile - no XML re-parse needed.
+                top_level_tags["imagej_metadata"] = imagej_metadata
 
             if not tif.series or not tif.series[0].pages:
                 context.logger.warning(
@@ -225,23 +251,93 @@ def extract(context: WorkflowContext) -> Dict[str, Any]:
 
             series = tif.series[0]
 
-            for i, page in enumerate(series.pages):
+            # Hot-loop locals: bind once outside the per-page/per-tag loops to
+            # avoid repeated attribute and method lookups on large files.
+            pages = series.pages
+            all_pages = raw_metadata["pages"]
+            all_pages_append = all_pages.append
+            is_qptiff = "QPTIFF" in tiff_file_path_str.upper()
+            _type = type
+            _try = _try_decode
+            _tag_names = _TAG_NAME_CACHE
+
+            for i, page in enumerate(pages):
                 page_data: Dict[str, Any] = {"page_index_in_series": i, "tags": {}}
 
-                if not hasattr(page, "tags") or not page.tags:
+                page_tags = getattr(page, "tags", None)
+                if not page_tags:
                     page_data["warning"] = (
                         "No TIFF tags available for this page (possibly a TiffFrame)."
                     )
-                    raw_metadata["pages"].append(page_data)
+                    all_pages_append(page_data)
                     continue
 
-                xml_str_from_description = _find_xml_description_in_tags(page)
+                # Single pass over the tags: the description XML candidate is
+                # picked up in-line instead of a separate pre-scan of
+                # page.tags, halving the per-tag attribute accesses per page.
+                # ImageDescription keeps priority over page.description.
+                xml_str_from_description: Optional[str] = None
+                tags_dict = page_data["tags"]
+                for tag_obj in page_tags.values():
+                    code = tag_obj.code
+                    tag_name = _tag_names.get(code)
+                    if tag_name is None:
+                        tag_name = tag_obj.name
+                        _tag_names[code] = tag_name
+                    tag_value = tag_obj.value
+                    value_type = _type(tag_value)
+
+                    if value_type is bytes:
+                        name_lower = tag_name.lower()
+                        decoded_value = (
+                            _try(tag_value)
+                            if any(tok in name_lower for tok in _XML_CANDIDATE_TOKENS)
+                            else None
+                        )
+                        if decoded_value and decoded_value.strip().startswith("<"):
+                            tags_dict[tag_name] = decoded_value
+                            if (
+                                xml_str_from_description is None
+                                and tag_name == "ImageDescription"
+                            ):
+                                xml_str_from_description = decoded_value
+                        else:
+                            tags_dict[tag_name] = repr(tag_value)
+                    elif value_type in _SEQ_TYPES:
+                        if tag_value and isinstance(tag_value[0], _NUM_TYPES):
+                            # Skip the copy when tifffile already gave a list.
+                            tags_dict[tag_name] = (
+                                tag_value
+                                if value_type is list
+                                else list(tag_value)
+                            )
+                        else:
+                            tags_dict[tag_name] = tag_value
+                    else:
+                        tags_dict[tag_name] = tag_value
+                        if (
+                            xml_str_from_description is None
+                            and tag_name == "ImageDescription"
+                            and value_type is str
+                            and tag_value.strip().startswith("<")
+                        ):
+                            xml_str_from_description = tag_value
+
+                if xml_str_from_description is None:
+                    # Fallback to page.description (less common for primary XML)
+                    desc_value = getattr(page, "description", None)
+                    if isinstance(desc_value, bytes):
+                        desc_value = _try_decode(desc_value)
+                    if isinstance(desc_value, str) and desc_value.strip().startswith(
+                        "<"
+                    ):
+                        xml_str_from_description = desc_value
+
                 if xml_str_from_description:
                     page_data["image_description_xml"] = xml_str_from_description
-                    if (
-                        "PerkinElmer" in xml_str_from_description
-                        or "QPTIFF" in tiff_file_path_str.upper()
-                    ):
+                    if not parse_xml:
+                        parsed_desc_xml = None
+                    elif "PerkinElmer" in xml_str_from_description or is_qptiff:
                         # _parse_perkinelmer_xml uses module logger
                         parsed_desc_xml = _parse_perkinelmer_xml(
                             xml_str_from_description
@@ -253,26 +349,7 @@ def extract(context: WorkflowContext) -> Dict[str, Any]:
                     if parsed_desc_xml:
                         page_data["structured_image_description"] = parsed_desc_xml
 
-                for tag_obj in page.tags.values():
-                    tag_name = tag_obj.name
-                    tag_value = tag_obj.value
-
-                    if isinstance(tag_value, bytes):
-                        decoded_value = _try_decode(tag_value)
-                        if decoded_value and decoded_value.strip().startswith("<"):
-                            page_data["tags"][tag_name] = decoded_value
-                        else:
-                            page_data["tags"][tag_name] = repr(tag_value)
-                    elif (
-                        isinstance(tag_value, (list, tuple))
-                        and tag_value
-                        and isinstance(tag_value[0], (int, float))
-                    ):
-                        page_data["tags"][tag_name] = list(tag_value)
-                    else:
-                        page_data["tags"][tag_name] = tag_value
-
-                raw_metadata["pages"].append(page_data)
+                all_pages_append(page_data)
 
             if top_level_tags:
                 raw_metadata["top_level_tags"] = top_level_tags
@@ -288,3 +365,19 @@ def extract(context: WorkflowContext) -> Dict[str, Any]:
         raw_metadata["error"] = str(e)
 
     return raw_metadata
+
+
+def batch_extract(contexts: List[WorkflowContext]) -> List[Dict[str, Any]]:
+    """
+    Extracts metadata for many files by fanning extract() out across a
+    process pool: the XML parse work is CPU-bound Python, so it scales with
+    cores only in separate processes. WorkflowContext pickles cleanly
+    (loggers reduce to their names), so workers receive full contexts.
+    Results come back in input order.
+    """
+    if len(contexts) <= 1:
+        # Pool startup would dominate a single extraction.
+        return [extract(ctx) for ctx in contexts]
+    max_workers = min(os.cpu_count() or 1, len(contexts))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(extract, contexts))
@@ -0,0 +1,151 @@
+# image_metadata_recorder/extractors/xml_util.py
+
+"""
+Shared helpers for turning parsed XML into the nested dict shape the
+extractors hand downstream, including scalar type coercion.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Union
+
+from image_metadata_recorder._lazy import lazy_import
+
+# Deferred until first attribute access; only the fallback parse path (no
+# lxml, or IMR_DISABLE_LXML set) ever touches it.
+xmltodict = lazy_import("xmltodict")
+
+# lxml parses in C and is typically several times faster than the pure-Python
+# xmltodict layer on multi-MB OME/CZI metadata blobs. It is an optional
+# accelerator: when it is not installed (or IMR_DISABLE_LXML is set, e.g. to
+# compare outputs), parsing falls back to xmltodict.
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:  # pragma: no cover - depends on environment
+    _lxml_etree = None
+
+
+def coerce_scalar(val: Optional[str]) -> Any:
+    """Coerces an XML text/attribute value to bool/int/float where possible."""
+    if val is None or not isinstance(val, str):
+        return val
+    if val.lower() in {"true", "false"}:
+        return val.lower() == "true"
+    try:
+        if "." in val or "e" in val.lower():  # Heuristic for float
+            return float(val)
+        elif val.lstrip("-+").isdigit():  # Check if it's an integer
+            return int(val)
+    except ValueError:
+        pass  # Keep as string if conversion fails
+    return val
+
+
+def _lxml_tag_name(elem: Any) -> str:
+    """
+    Reconstructs the document-form tag name ('prefix:local' or 'local') from
+    lxml's '{namespace-uri}local' Clark notation, matching the raw names
+    xmltodict reports with namespace processing disabled.
+    """
+    tag = elem.tag
+    if tag.startswith("{"):
+        local = tag.rsplit("}", 1)[1]
+        prefix = elem.prefix
+        return f"{prefix}:{local}" if prefix else local
+    return tag
+
+
+def _lxml_elem_to_dict(elem: Any) -> Union[Dict[str, Any], Any]:
+    """
+    Converts an lxml element to the nested dict shape xmltodict produces
+    ('@attr' keys, '#text' for mixed content, lists for repeated child tags,
+    None for empty elements). Comments and processing instructions are
+    skipped; xmlns declarations are not materialised as attributes.
+    """
+    result: Dict[str, Any] = {}
+    for attr_name, attr_value in elem.attrib.items():
+        if attr_name.startswith("{"):
+            attr_name = attr_name.rsplit("}", 1)[1]
+        result["@" + attr_name] = attr_value
+
+    for child in elem:
+        if not isinstance(child.tag, str):  # comment / processing instruction
+            continue
+        child_value = _lxml_elem_to_dict(child)
+        tag = _lxml_tag_name(child)
+        if tag in result:
+            existing = result[tag]
+            if isinstance(existing, list):
+                existing.append(child_value)
+            else:
+                result[tag] = [existing, child_value]
+        else:
+            result[tag] = child_value
+
+    text = elem.text.strip() if elem.text else ""
+    if text:
+        if result:
+            result["#text"] = text
+        else:
+            return text
+    return result if result else None
+
+
+def _xml_to_dict_lxml(xml_bytes: bytes) -> Dict[str, Any]:
+    """Parses XML bytes with lxml's C parser and builds the dict directly."""
+    root = _lxml_etree.fromstring(xml_bytes)
+    return {_lxml_tag_name(root): _lxml_elem_to_dict(root)}
+
+
+def parse_xml_to_dict(xml_input: Union[str, bytes]) -> Dict[str, Any]:
+    """
+    Parses an XML document into xmltodict-shaped nested dicts, using lxml
+    when available and falling back to xmltodict otherwise. String values are
+    left uncoerced; run the result through coerce_leaves() for typing.
+
+    Raises on malformed XML (whichever backend is active); callers are
+    expected to handle parse failures.
+    """
+    if _lxml_etree is not None and not os.environ.get("IMR_DISABLE_LXML"):
+        if isinstance(xml_input, str):
+            # lxml rejects unicode strings that carry an encoding declaration.
+            xml_input = xml_input.encode("utf-8")
+        return _xml_to_dict_lxml(xml_input)
+
+    return xmltodict.parse(
+        xml_input,
+        process_namespaces=False,
+        namespaces=None,
+    )
+
+
+def coerce_leaves(
+    tree: Union[Dict[str, Any], List[Any], Any],
+) -> Union[Dict[str, Any], List[Any], Any]:
+    """
+    Coerces every string leaf of a parsed-XML dict tree to bool/int/float in
+    one iterative pass, mutating the tree in place.
+
+    This replaces the per-element xmltodict ``postprocessor`` callback, which
+    dispatched a Python call for every element and attribute: one tight loop
+    over the finished tree does the same coercion without N callback
+    invocations. Returns the tree for convenience.
+    """
+    _isinstance = isinstance
+    _coerce = coerce_scalar
+    stack: List[Any] = [tree]
+    stack_append = stack.append
+    while stack:
+        node = stack.pop()
+        if _isinstance(node, dict):
+            for key, value in node.items():
+                if _isinstance(value, str):
+                    node[key] = _coerce(value)
+                elif _isinstance(value, (dict, list)):
+                    stack_append(value)
+        elif _isinstance(node, list):
+            for i, value in enumerate(node):
+                if _isinstance(value, str):
+                    node[i] = _coerce(value)
+                elif _isinstance(value, (dict, list)):
+                    stack_append(value)
+    return tree
@@ -1,18 +1,33 @@
 # image_metadata_recorder/processors/standard_processor.py
 
+import functools
 import re
 from typing import Any, Dict, List, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Single combined pattern for numeric string coercion: integers, and floats
+# with digits on at least one side of the decimal point (same forms the three
+# previous separate patterns accepted).
+_NUM_RE = re.compile(r"^-?(?:\d+|\d*\.\d+|\d+\.\d*)$")
+
 
 # Helper functions from the original standard_normalizer.py
+@functools.lru_cache(maxsize=4096)
 def _to_camel_case(text: str) -> str:
-    """Converts snake_case, kebab-case, space-separated, or PascalCase text to camelCase."""
+    """Converts snake_case, kebab-case, space-separated, or PascalCase text to camelCase.
+
+    Memoized: keys repeat heavily across pages (ImageWidth, BitsPerSample,
+    ...), so after the first page nearly every call is a cache hit.
+    """
     if not text:
         return ""
 
+    # Fast path: already camelCase (starts lower, no separators) - return as is.
+    if text[0].islower() and "_" not in text and "-" not in text and " " not in text:
+        return text
+
     # Normalize separators (hyphen, underscore, space) to space, then split
     s = text.replace("-", " ").replace("_", " ")
     parts = s.split()  # Splits by space and handles multiple spaces
@@ -32,84 +47,154 @@ def _to_camel_case(text: str) -> str:
     return first_word + following_words
 
 
+def _coerce_numeric_str(data: str) -> Union[str, int, float]:
+    """Coerces a string to int/float when it looks numeric, else returns it."""
+    # Cheap first-character test rejects the common non-numeric case
+    # before the (single, precompiled) regex runs.
+    if not data or data[0] not in "-0123456789.":
+        return data
+    if _NUM_RE.match(data):
+        try:
+            return float(data) if "." in data else int(data)
+        except ValueError:
+            pass
+    return data
+
+
 def normalize_recursively(
     data: Union[Dict[str, Any], List[Any], Any],
 ) -> Union[Dict[str, Any], List[Any], Any]:
     """
-    Recursively converts all keys in a dictionary to camelCase and processes nested structures.
+    Converts all keys in a dictionary to camelCase and processes nested structures.
     Attempts to coerce string representations of numbers to numeric types.
+
+    The traversal is iterative: each container pushes its children onto an
+    explicit stack alongside the output container being built, so deep
+    OME-XML/CZI trees cost one Python frame instead of one per node and
+    cannot hit the recursion limit.
     """
     if isinstance(data, dict):
-        new_dict = {}
-        for key, value in data.items():
-            new_key = _to_camel_case(str(key))
-            new_dict[new_key] = normalize_recursively(
-                value
-            )  # Value is processed recursively
-        return new_dict
+        root: Union[Dict[str, Any], List[Any]] = {}
     elif isinstance(data, list):
-        return [normalize_recursively(item) for item in data]
+        root = []
     elif isinstance(data, str):
-        if re.match(r"^-?\d+$", data):
-            try:
-                return int(data)
-            except ValueError:
-                pass
-        elif re.match(r"^-?\d*\.\d+$", data) or re.match(r"^-?\d+\.\d*$", data):
-            try:
-                return float(data)
-            except ValueError:
-                pass
-        return data
+        return _coerce_numeric_str(data)
     else:
         return data
 
+    # Hot-loop locals.
+    _isinstance = isinstance
+    _camel = _to_camel_case
+    _coerce = _coerce_numeric_str
+    stack: List[Any] = [(data, root)]
+    stack_append = stack.append
+    while stack:
+        src, dst = stack.pop()
+        if _isinstance(src, dict):
+            for key, value in src.items():
+                new_key = _camel(str(key))
+                if _isinstance(value, dict):
+                    child: Union[Dict[str, Any], List[Any]] = {}
+                    dst[new_key] = child
+                    stack_append((value, child))
+                elif _isinstance(value, list):
+                    child = []
+                    dst[new_key] = child
+                    stack_append((value, child))
+                elif _isinstance(value, str):
+                    dst[new_key] = _coerce(value)
+                else:
+                    dst[new_key] = value
+        else:  # list
+            dst_append = dst.append
+            for value in src:
+                if _isinstance(value, dict):
+                    child = {}
+                    dst_append(child)
+                    stack_append((value, child))
+                elif _isinstance(value, list):
+                    child = []
+                    dst_append(child)
+                    stack_append((value, child))
+                elif _isinstance(value, str):
+                    dst_append(_coerce(value))
+                else:
+                    dst_append(value)
+    return root
+
+
+# Common, high-value tags hoisted from a page's 'tags' dict to the page
+# level. A frozenset so the promotion candidates come from one set
+# intersection with the tags' keys (O(min(len)) in C) instead of per-key
+# membership tests; promoted keys are inserted in sorted order to keep the
+# output deterministic.
+_KEYS_TO_PROMOTE = frozenset(
+    {
+        "imageWidth",
+        "imageLength",
+        "bitsPerSample",
+        "dateTime",
+        "software",
+        "compression",
+        "photometricInterpretation",
+        "xResolution",
+        "yResolution",
+        "resolutionUnit",
+        "sampleFormat",
+    }
+)
+
+
+def _normalize_page(page: Any) -> Any:
+    """Normalizes a single page dict and promotes high-value tags in-line."""
+    normalized = normalize_recursively(page)
+
+    if (
+        not isinstance(normalized, dict)
+        or "tags" not in normalized
+        or not isinstance(normalized.get("tags"), dict)
+    ):
+        logger.debug(
+            "Skipping page for promotion: not a dict, or 'tags' key missing/invalid."
+        )
+        return normalized
+
+    tags = normalized["tags"]
+    promoted = _KEYS_TO_PROMOTE & tags.keys()
+    if promoted:
+        tags_pop = tags.pop
+        for key in sorted(promoted):
+            normalized[key] = tags_pop(key)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Promoted keys %s to page level.", sorted(promoted))
+
+    if not tags:
+        normalized.pop("tags")
+        logger.debug(
+            "Removed empty 'tags' dictionary from page level after promotion."
+        )
+
+    return normalized
+
 
 def process(raw_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Cleans and restructures a raw metadata dictionary for schema-less downstream use.
     - Recursively cleans all keys to camelCase and coerces values to appropriate types.
     - Promotes common, high-value tags from any nested 'tags' dictionary to the parent 'page' level for easier access.
+
+    Normalization and promotion happen in a single traversal: each page is
+    promoted as it is normalized instead of re-walking the 'pages' list in a
+    second pass.
     """
     logger.info("Processing raw metadata for key cleaning and field promotion.")
 
-    processed_data = normalize_recursively(raw_data)
-
-    if "pages" in processed_data and isinstance(processed_data.get("pages"), list):
-        for page in processed_data["pages"]:
-            if (
-                not isinstance(page, dict)
-                or "tags" not in page
-                or not isinstance(page.get("tags"), dict)
-            ):
-                logger.debug(
-                    "Skipping page for promotion: not a dict, or 'tags' key missing/invalid."
-                )
-                continue
-
-            keys_to_promote = [
-                "imageWidth",
-                "imageLength",
-                "bitsPerSample",
-                "dateTime",
-                "software",
-                "compression",
-                "photometricInterpretation",
-                "xResolution",
-                "yResolution",
-                "resolutionUnit",
-                "sampleFormat",
-            ]
-
-            for key in keys_to_promote:
-                if key in page["tags"]:
-                    page[key] = page["tags"].pop(key)
-                    logger.debug("Promoted key '%s' to page level.", key)
-
-            if page.get("tags") == {}:
-                page.pop("tags")
-                logger.debug(
-                    "Removed empty 'tags' dictionary from page level after promotion."
-                )
+    processed_data: Dict[str, Any] = {}
+    for key, value in raw_data.items():
+        new_key = _to_camel_case(str(key))
+        if new_key == "pages" and isinstance(value, list):
+            processed_data[new_key] = [_normalize_page(page) for page in value]
+        else:
+            processed_data[new_key] = normalize_recursively(value)
 
     return processed_data
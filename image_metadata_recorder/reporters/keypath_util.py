@@ -1,46 +1,99 @@
-import re
-from typing import Any, Set, List
+import os
+import sys
+from typing import Any, Dict, Set, List, Tuple
 
 
 def extract_key_paths(data: Any, parent: str = "") -> Set[str]:
     """
-    Recursively extract all key paths from a nested dict/list.
+    Extract all key paths from a nested dict/list.
     Returns a set of dot-separated key paths, including indices for lists.
     """
-    paths = set()
-    if isinstance(data, dict):
-        for k, v in data.items():
-            path = f"{parent}.{k}" if parent else k
-            paths.add(path)
-            paths.update(extract_key_paths(v, path))
-    elif isinstance(data, list):
-        for i, item in enumerate(data):
-            path = f"{parent}.{i}" if parent else str(i)
-            paths.add(path)
-            paths.update(extract_key_paths(item, path))
-    return paths
+    paths, _ = analyze(data)
+    if parent:
+        return {f"{parent}.{p}" for p in paths}
+    return set(paths)
 
 
-def template_key_paths(paths: Set[str]) -> List[str]:
+def analyze(data: Any) -> Tuple[List[str], List[str]]:
     """
-    Replace all numeric indices in key paths with [] for structure template.
-    Returns a sorted list of unique template paths.
+    Single-traversal equivalent of extract_key_paths followed by template
+    generation: every node emits its concrete dotted path and its template
+    path (all-digit parts - list indices and numeric dict keys - as '[]')
+    in the same pass, so the tree is walked once and nothing is re-split
+    downstream.
+    Returns (sorted key paths, sorted template paths).
     """
-    return sorted({re.sub(r"\.(\d+)", r".[]", p) for p in paths})
+    # Insertion-ordered dicts act as ordered sets: dedup costs the same as a
+    # set but the discovery order is preserved, so a future caller that does
+    # not need diff-stable files could skip the sort. The final sorted() stays
+    # because this walker pops a LIFO stack (not canonical order) and the
+    # emitted files are consumed by diff-comparison tools.
+    paths: Dict[str, None] = {}
+    templates: Dict[str, None] = {}
+    paths_add = paths.__setitem__
+    templates_add = templates.__setitem__
+    _isinstance = isinstance
+    # TIFF/EXIF metadata repeats the same key strings ("imageWidth", "tags",
+    # ...) across every page, and list indices repeat across every list.
+    # Interning the parts makes each repeated part a single shared string
+    # (and a pointer-equal dict/set hit) instead of thousands of equal
+    # copies, which matters on multi-page files with large tag tables.
+    _intern = sys.intern
+    stack: List[Tuple[Any, str, str]] = [(data, "", "")]
+    stack_append = stack.append
+    while stack:
+        node, parent_path, parent_tmpl = stack.pop()
+        if _isinstance(node, dict):
+            for k, v in node.items():
+                key = _intern(str(k))
+                path = f"{parent_path}.{key}" if parent_path else key
+                # All-digit dict keys (e.g. unknown TIFF tag codes, which
+                # tifffile names by number) collapse to '[]' like list
+                # indices do: the template convention is "any numeric part
+                # is a placeholder", matching structure_reporter's
+                # _path_to_template.
+                tkey = "[]" if key.isdigit() else key
+                tmpl = f"{parent_tmpl}.{tkey}" if parent_tmpl else tkey
+                paths_add(path, None)
+                templates_add(tmpl, None)
+                if _isinstance(v, (dict, list)):
+                    stack_append((v, path, tmpl))
+        elif _isinstance(node, list):
+            for i, item in enumerate(node):
+                idx = _intern(str(i))
+                path = f"{parent_path}.{idx}" if parent_path else idx
+                tmpl = f"{parent_tmpl}.[]" if parent_tmpl else "[]"
+                paths_add(path, None)
+                templates_add(tmpl, None)
+                if _isinstance(item, (dict, list)):
+                    stack_append((item, path, tmpl))
+    return sorted(paths), sorted(templates)
+
+
+def _dump_lines(path: str, lines: List[str]) -> None:
+    """
+    Writes the joined lines to `path` in one os.write on a raw fd: each file
+    is a single pre-encoded payload, so the TextIOWrapper/BufferedWriter
+    layers would only add Python-level overhead between the join and the
+    syscall. open/write/close is the minimal three-syscall sequence per file.
+    """
+    payload = ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
 
 
 def write_key_paths_to_file(data: Any, keypath_file: str, template_file: str):
     """
     Given a dict (parsed JSON), write all key paths and structure template paths to files.
     """
-    key_paths = sorted(extract_key_paths(data))
-    with open(keypath_file, "w") as f:
-        for p in key_paths:
-            f.write(p + "\n")
-    structure_paths = template_key_paths(set(key_paths))
-    with open(template_file, "w") as f:
-        for p in structure_paths:
-            f.write(p + "\n")
+    # Both outputs come from a single fused traversal; each lands on disk as
+    # one low-level write of its joined payload.
+    key_paths, structure_paths = analyze(data)
+    _dump_lines(keypath_file, key_paths)
+    _dump_lines(template_file, structure_paths)
 
 
 # Example usage (uncomment to use as a script):
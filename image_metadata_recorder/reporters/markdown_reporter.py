@@ -12,6 +12,9 @@ Typical usage:
     # or a filepath and converts it, as pypandoc works with files.
 """
 
+from collections import defaultdict
+from functools import lru_cache
+from itertools import islice
 from typing import List, Optional
 import os
 import logging
@@ -22,9 +25,88 @@ from image_metadata_recorder.workflow.context import WorkflowContext
 from typing import Dict, Any, List, Optional  # Ensure List and Optional are imported
 import json
 
+try:
+    # Optional fast JSON serializer for the embedded metadata blocks; the
+    # stdlib encoder remains the fallback (same pattern as the workflow).
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 # Module-level logger is fine for general info, but operations will use context.logger
 logger = logging.getLogger(__name__)
 
+# Static table templates: each fixed table is one format_map over a
+# module-level constant instead of a per-row f-string, so the final join sees
+# one string per table. Placeholders are the processed page's field names;
+# both tables render from one shared "N/A"-defaulting view of the page, so
+# each field costs a single dict lookup. Rendered output is unchanged.
+_GENERAL_PROPS_TPL = (
+    "| Property        | Value                                  |\n"
+    "|:----------------|:---------------------------------------|\n"
+    "| Image Width     | {imageWidth} |\n"
+    "| Image Length    | {imageLength} |\n"
+    "| Bits Per Sample | {bitsPerSample} |\n"
+    "| Date/Time       | {dateTime} |"
+)
+
+_TECH_DETAILS_TPL = (
+    "| Detail                      | Value                                         |\n"
+    "|:----------------------------|:----------------------------------------------|\n"
+    "| Software                    | {software} |\n"
+    "| Compression                 | {compression} |\n"
+    "| Photometric Interpretation  | {photometricInterpretation} |\n"
+    "| X Resolution                | {xResolution} |\n"
+    "| Y Resolution                | {yResolution} |\n"
+    "| Resolution Unit             | {resolutionUnit} |\n"
+    "| Sample Format               | {sampleFormat} |"
+)
+
+
+@lru_cache(maxsize=8)
+def _schema_field_sets(schema_version: Optional[str]):
+    """
+    Returns the (page-level, root-level) field names the fixed report
+    sections already render for the given schema version, as frozensets.
+    The sets are fixed per schema, so resolving them is memoized: the
+    per-call set-literal construction pays once per schema instead of once
+    per file. Every current schema shares one layout; a future version
+    that adds or renames fixed fields gets its own entry here.
+    """
+    page_fields = frozenset(
+        {
+            "imageWidth",
+            "imageLength",
+            "bitsPerSample",
+            "dateTime",
+            "software",
+            "compression",
+            "photometricInterpretation",
+            "xResolution",
+            "yResolution",
+            "resolutionUnit",
+            "sampleFormat",
+            "pageIndex",
+            "parsedName",
+            "tags",
+        }
+    )
+    root_fields = frozenset({"pages", "sourceFile", "schemaVersion"})
+    return page_fields, root_fields
+
+
+def _render_truncated_table(
+    table: Dict[str, Any], lines: List[str], limit: int = 5
+) -> None:
+    """
+    Appends up to `limit` key/value rows from `table` (values clipped to 100
+    chars) followed by an '...and N more' summary row when truncated. Shared
+    by the remaining-tags and other-fields tables.
+    """
+    for key, value in islice(table.items(), limit):
+        lines.append(f"| {key} | {str(value)[:100]} |")
+    if len(table) > limit:
+        lines.append(f"| ...and {len(table) - limit} more | |")
+
 
 def generate_markdown_content(
     metadata: Dict[str, Any], context: WorkflowContext
@@ -39,17 +121,15 @@ def generate_markdown_content(
     Returns:
         A string containing the complete Markdown report.
     """
-
-    # Helper to safely get values and format them for the report
-    def format_value(value: Any, default_na: bool = True) -> str:
-        if value is None:
-            return "N/A" if default_na else ""
-        return str(value)
-
     source_file = metadata.get("sourceFile", "Unknown Source File")
+    explicitly_handled_keys, known_root_fields_handled_elsewhere = _schema_field_sets(
+        metadata.get("schemaVersion")
+    )
+
+    basename = os.path.basename(source_file)
 
     lines: List[str] = [
-        f"# Metadata Report for {os.path.basename(source_file)}",
+        f"# Metadata Report for {basename}",
         f"**Source File:** `{source_file}`",
     ]
     lines.append("\n")
@@ -61,53 +141,21 @@ def generate_markdown_content(
     first_page: Optional[Dict[str, Any]] = next(iter(pages_data), None)
 
     if first_page:
-        lines.extend(
-            [
-                "| Property        | Value                                  |",
-                "|:----------------|:---------------------------------------|",
-                f"| Image Width     | {format_value(first_page.get('imageWidth'))} |",
-                f"| Image Length    | {format_value(first_page.get('imageLength'))} |",
-                f"| Bits Per Sample | {format_value(first_page.get('bitsPerSample'))} |",
-                f"| Date/Time       | {format_value(first_page.get('dateTime'))} |",
-            ]
+        # One stringified, "N/A"-defaulting view of the page feeds both
+        # fixed tables; missing and None fields render as N/A.
+        safe_page = defaultdict(
+            lambda: "N/A",
+            {k: str(v) for k, v in first_page.items() if v is not None},
         )
+        lines.append(_GENERAL_PROPS_TPL.format_map(safe_page))
         lines.append("\n")
 
         lines.append("## Technical Details (from first page if available)")
-        lines.extend(
-            [
-                "| Detail                      | Value                                         |",
-                "|:----------------------------|:----------------------------------------------|",
-                f"| Software                    | {format_value(first_page.get('software'))} |",
-                f"| Compression                 | {format_value(first_page.get('compression'))} |",
-                f"| Photometric Interpretation  | {format_value(first_page.get('photometricInterpretation'))} |",
-                f"| X Resolution                | {format_value(first_page.get('xResolution'))} |",
-                f"| Y Resolution                | {format_value(first_page.get('yResolution'))} |",
-                f"| Resolution Unit             | {format_value(first_page.get('resolutionUnit'))} |",
-                f"| Sample Format               | {format_value(first_page.get('sampleFormat'))} |",
-            ]
-        )
+        lines.append(_TECH_DETAILS_TPL.format_map(safe_page))
         lines.append("\n")
 
         # Section for other/unprocessed tags from the first page:
         # Iterate over keys not already explicitly handled.
-        explicitly_handled_keys = {
-            "imageWidth",
-            "imageLength",
-            "bitsPerSample",
-            "dateTime",
-            "software",
-            "compression",
-            "photometricInterpretation",
-            "xResolution",
-            "yResolution",
-            "resolutionUnit",
-            "sampleFormat",
-            "pageIndex",
-            "parsedName",
-            "tags",
-        }
-
         other_page_keys = {
             k: v for k, v in first_page.items() if k not in explicitly_handled_keys
         }
@@ -118,14 +166,7 @@ def generate_markdown_content(
             lines.append("### Remaining Tags from First Page (under 'tags' key):")
             lines.append("| Tag Key (Raw) | Value (Raw) |")
             lines.append("|:--------------|:------------|")
-            count = 0
-            for key, value in current_page_tags.items():
-                if count < 5:
-                    lines.append(f"| {key} | {str(value)[:100]} |")
-                    count += 1
-                else:
-                    lines.append(f"| ...and {len(current_page_tags) - count} more | |")
-                    break
+            _render_truncated_table(current_page_tags, lines)
             lines.append("\n")
         elif (
             isinstance(current_page_tags, dict) and not current_page_tags
@@ -139,14 +180,7 @@ def generate_markdown_content(
             lines.append("### Other Top-Level Fields from First Page:")
             lines.append("| Field Key     | Value       |")
             lines.append("|:--------------|:------------|")
-            count = 0
-            for key, value in other_page_keys.items():
-                if count < 5:
-                    lines.append(f"| {key} | {str(value)[:100]} |")
-                    count += 1
-                else:
-                    lines.append(f"| ...and {len(other_page_keys)-count} more | |")
-                    break
+            _render_truncated_table(other_page_keys, lines)
             lines.append("\n")
     else:
         lines.append("No page data available to display general properties.")
@@ -155,12 +189,6 @@ def generate_markdown_content(
     # Structured Metadata (Catch-all from the root of the metadata dictionary)
     lines.append("## Other Root-Level Metadata Blocks")
 
-    known_root_fields_handled_elsewhere = {
-        "pages",
-        "sourceFile",
-        "schemaVersion",
-    }
-
     other_root_data = {
         k: v
         for k, v in metadata.items()
@@ -172,7 +200,15 @@ def generate_markdown_content(
             lines.append(f"### {key}")
             try:
                 if isinstance(value_block, (dict, list)):
-                    value_str = json.dumps(value_block, indent=2, default=str)
+                    # Large XMP/OME blocks dominate report generation when
+                    # pushed through the pure-Python indented encoder; orjson
+                    # serializes them in one C pass when available.
+                    if orjson is not None:
+                        value_str = orjson.dumps(
+                            value_block, option=orjson.OPT_INDENT_2, default=str
+                        ).decode()
+                    else:
+                        value_str = json.dumps(value_block, indent=2, default=str)
                     lines.append(f"```json\n{value_str}\n```")
                 else:
                     lines.append(f"```\n{str(value_block)}\n```")
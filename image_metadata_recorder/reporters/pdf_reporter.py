@@ -0,0 +1,63 @@
+# image_metadata_recorder/reporters/pdf_reporter.py
+
+"""PDF report generation from Markdown reports.
+
+Conversion goes through pypandoc, which is optional: when it (or a pandoc
+binary) is not installed, the functions log and return without failing the
+workflow. Each conversion spawns pandoc plus a LaTeX engine, and that process
+startup dominates for small reports - so the batch entry point overlaps many
+conversions with a thread pool (the threads only wait on the external
+processes; the real work happens in pandoc).
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    # Optional dependency: pandoc/LaTeX are heavyweight installs, so PDF
+    # output is best-effort rather than a hard requirement.
+    import pypandoc
+except ImportError:  # pragma: no cover - depends on the environment
+    pypandoc = None
+
+
+def create_pdf_report(md_path: str, pdf_path: str) -> bool:
+    """
+    Converts a single Markdown report to PDF. Returns True on success,
+    False when pypandoc is unavailable or the conversion fails.
+    """
+    if pypandoc is None:
+        logger.debug(
+            "pypandoc is not installed; skipping PDF generation for %s.", md_path
+        )
+        return False
+    try:
+        pypandoc.convert_file(md_path, "pdf", outputfile=pdf_path)
+        logger.info("PDF report saved to: %s", pdf_path)
+        return True
+    except Exception as e:
+        logger.error("Failed to convert %s to PDF: %s", md_path, e)
+        return False
+
+
+def create_pdf_reports(
+    pairs: List[Tuple[str, str]], max_workers: int = None
+) -> List[bool]:
+    """
+    Converts many (md_path, pdf_path) pairs, overlapping the pandoc/LaTeX
+    process startups with a thread pool. Returns per-pair success flags in
+    input order.
+    """
+    if pypandoc is None:
+        logger.debug("pypandoc is not installed; skipping PDF generation.")
+        return [False] * len(pairs)
+    if len(pairs) <= 1:
+        return [create_pdf_report(md, pdf) for md, pdf in pairs]
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, len(pairs))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda pair: create_pdf_report(*pair), pairs))
@@ -17,6 +17,7 @@ Typical usage:
     >>>         f.write(path + "\\n")
 """
 
+import functools
 from typing import List, Dict, Any, Set, Union, Optional  # Added Optional
 import logging
 
@@ -27,6 +28,16 @@ from image_metadata_recorder.workflow.context import (
 # Module-level logger can be kept for general module info
 logger = logging.getLogger(__name__)
 
+# Keys are drawn from a small, fixed vocabulary of tag names that repeat on
+# every page, so sanitized forms are cached with a near-100% hit rate.
+_SAFE_KEY_CACHE: Dict[str, str] = {}
+
+# Small-integer strings precomputed once: list indices are the only all-digit
+# tokens upstream produces, and virtually all of them are small, so a hash
+# lookup replaces the per-character isdigit() scan in the template rewrite.
+# isdigit() remains as the fallback for indices beyond the table.
+_DIGIT_STRS = frozenset(map(str, range(4096)))
+
 
 def _extract_key_paths_from_data(
     data: Union[Dict[str, Any], List[Any]],
@@ -34,30 +45,39 @@ def _extract_key_paths_from_data(
     context: Optional[WorkflowContext] = None,
 ) -> List[str]:
     """
-    Recursively extracts all possible key paths from a nested data structure.
+    Extracts all possible key paths from a nested data structure.
     Optionally uses logger from context if provided.
+
+    Iterative, stack-based traversal (mirroring keypath_util): one Python
+    frame for the whole tree instead of one per node, no RecursionError
+    ceiling on deep IFD/EXIF structures. Callers aggregate into sets, so
+    traversal order is not significant.
     """
-    # This helper is mostly pure, but could log if context is passed, e.g., for very deep recursion warnings.
-    # For now, direct context use is minimal here to keep it simple.
-    # If context was mandatory: def _extract_key_paths_from_data(data: ..., parent_path: str, context: WorkflowContext)
-
-    paths = []
-    if isinstance(data, dict):
-        for key, value in data.items():
-            current_key_str = str(key).replace(".", "_")
-            path = (
-                f"{parent_path}.{current_key_str}" if parent_path else current_key_str
-            )
-            paths.append(path)
-            paths.extend(
-                _extract_key_paths_from_data(value, path, context)
-            )  # Pass context along
-    elif isinstance(data, list):
-        for i, item in enumerate(data):
-            path = f"{parent_path}.{i}"
-            paths.extend(
-                _extract_key_paths_from_data(item, path, context)
-            )  # Pass context along
+    # This helper is mostly pure, but could log if context is passed.
+    paths: List[str] = []
+    # Bind hot names to locals for the tight loop.
+    paths_append = paths.append
+    _isinstance = isinstance
+    safe_key_cache = _SAFE_KEY_CACHE
+    stack: List[Any] = [(data, parent_path)]
+    stack_append = stack.append
+    while stack:
+        node, prefix = stack.pop()
+        if _isinstance(node, dict):
+            for key, value in node.items():
+                key_str = key if _isinstance(key, str) else str(key)
+                current_key_str = safe_key_cache.get(key_str)
+                if current_key_str is None:
+                    current_key_str = key_str.replace(".", "_")
+                    safe_key_cache[key_str] = current_key_str
+                path = f"{prefix}.{current_key_str}" if prefix else current_key_str
+                paths_append(path)
+                if _isinstance(value, (dict, list)):
+                    stack_append((value, path))
+        elif _isinstance(node, list):
+            for i, item in enumerate(node):
+                if _isinstance(item, (dict, list)):
+                    stack_append((item, f"{prefix}.{i}"))
     return paths
 
 
@@ -76,28 +96,34 @@ def get_all_key_paths_from_metadata(
         A sorted list of unique dot-notation key paths.
     """
     all_paths: Set[str] = set()
-
-    # Extract paths from root-level structured_metadata
-    if metadata.get("structured_metadata"):
-        context.logger.debug("Extracting paths from root structured_metadata.")
+    # Checked once here rather than per debug call: with f-string logging the
+    # message is formatted before the level check, so on a multi-hundred-page
+    # file the per-page debug below would build hundreds of strings that are
+    # then dropped whenever the effective level is INFO or above.
+    _debug_enabled = context.logger.isEnabledFor(logging.DEBUG)
+
+    # Extract paths from root-level structured_metadata. The walrus binds the
+    # looked-up value so each check-then-use costs one dict lookup, not two.
+    if structured := metadata.get("structured_metadata"):
+        if _debug_enabled:
+            context.logger.debug("Extracting paths from root structured_metadata.")
         # Pass context to helper, though its direct use there is currently minimal
         paths_from_structured = _extract_key_paths_from_data(
-            metadata["structured_metadata"], "structured_metadata", context
+            structured, "structured_metadata", context
         )
         all_paths.update(paths_from_structured)
 
     # Extract paths from page-level unprocessed_tags
-    if metadata.get("pages"):
-        for i, page in enumerate(metadata["pages"]):
-            if page.get("unprocessed_tags"):
+    for i, page in enumerate(metadata.get("pages") or []):
+        if tags := page.get("unprocessed_tags"):
+            if _debug_enabled:
                 context.logger.debug(
                     f"Extracting paths from unprocessed_tags for page {i}."
                 )
-                page_tags_prefix = f"pages.{i}.unprocessed_tags"
-                paths_from_page_tags = _extract_key_paths_from_data(
-                    page["unprocessed_tags"], page_tags_prefix, context
-                )
-                all_paths.update(paths_from_page_tags)
+            page_tags_prefix = f"pages.{i}.unprocessed_tags"
+            all_paths.update(
+                _extract_key_paths_from_data(tags, page_tags_prefix, context)
+            )
 
     context.logger.info(
         f"Extracted {len(all_paths)} unique key paths from metadata for {context.current_base_filename}."
@@ -105,6 +131,20 @@ def get_all_key_paths_from_metadata(
     return sorted(list(all_paths))
 
 
+@functools.lru_cache(maxsize=100_000)
+def _path_to_template(path: str) -> str:
+    """
+    Converts a single dot-notation path to its template form, replacing
+    numeric list indices with '[]'. Memoized because the same dotted paths
+    recur thousands of times across pages/tags of multi-page files, so
+    repeated paths skip the split/join work entirely.
+    """
+    parts = path.split(".")
+    return ".".join(
+        "[]" if (part in _DIGIT_STRS or part.isdigit()) else part for part in parts
+    )
+
+
 def generate_structure_template_from_paths(
     key_paths: List[str], context: WorkflowContext
 ) -> List[str]:
@@ -130,15 +170,22 @@ def generate_structure_template_from_paths(
     for path in key_paths:
         if not path:
             continue  # Skip empty paths if any
-        parts = path.split(".")
-        # Replace numeric parts (list indices) with '[]'
-        template_parts = [part if not part.isdigit() else "[]" for part in parts]
-        templates.add(".".join(template_parts))
+        # Replace numeric parts (list indices) with '[]' via the memoized helper
+        templates.add(_path_to_template(path))
 
     context.logger.info(
         f"Generated {len(templates)} unique template paths from {len(key_paths)} raw paths for {context.current_base_filename}."
     )
-    return sorted(list(templates))
+    return sorted(templates)
+
+
+def generate_structure_template_set(key_paths: List[str]) -> Set[str]:
+    """
+    Set-returning variant of `generate_structure_template_from_paths` for
+    callers that only need membership tests and no deterministic ordering
+    (skips the sort and the intermediate list copy).
+    """
+    return {_path_to_template(path) for path in key_paths if path}
 
 
 def create_structure_report_file(
@@ -1,63 +1,124 @@
 # image_metadata_recorder/workflow/context.py
+import dataclasses
+import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Any
-from pydantic import BaseModel, Field
+from typing import Any, ClassVar, Dict, Optional, Tuple, Union
 
 
-class WorkflowContext(BaseModel):
+@dataclass
+class WorkflowContext:
     """
     Manages and passes shared state and configurations throughout the metadata processing pipeline.
+
+    A plain dataclass: the context is internal, so nothing needs runtime
+    validation or coercion, and dataclass instantiation/attribute access is
+    far cheaper than a validating model on the per-file hot path.
     """
 
     # Core resources
-    output_dir: Path = Field(
-        ..., description="The base directory where all output files will be saved."
-    )
-    logger: Any = Field(
-        ...,
-        description="A configured logger instance for consistent logging across components.",
-    )
+    #: The base directory where all output files will be saved.
+    output_dir: Path
+    #: A configured logger instance for consistent logging across components.
+    logger: Any
 
     # File-specific information (could be updated per file in a batch process)
-    current_input_filepath: Optional[Path] = Field(
-        None,
-        description="The absolute path to the image file currently being processed.",
-    )
-    current_base_filename: Optional[str] = Field(
-        None, description="The base name (stem) of the file currently being processed."
-    )
+    #: The absolute path to the image file currently being processed.
+    current_input_filepath: Optional[Path] = None
+    #: The base name (stem) of the file currently being processed.
+    current_base_filename: Optional[str] = None
 
     # Configuration / Flags (can be extended)
-    skip_pdf_generation: bool = Field(
-        False,
-        description="Flag to indicate whether PDF report generation should be skipped.",
-    )
-    # Example: Could add more config like 'force_overwrite: bool = False'
+    #: Flag to indicate whether PDF report generation should be skipped.
+    skip_pdf_generation: bool = False
+    #: Whether extractors should parse embedded XML into structured dicts.
+    #: Pipelines that only need the raw XML strings preserved can disable
+    #: this to skip the XML-to-dict conversion entirely.
+    parse_xml: bool = True
+    #: When False, files whose report is already newer than the input are
+    #: skipped entirely; set True to regenerate every artifact regardless.
+    force_overwrite: bool = False
 
     # Placeholder for other shared resources or results that components might need to pass
-    # shared_cache: Optional[Dict[str, Any]] = Field(default_factory=dict, description="A shared cache for intermediate results, if needed.")
+    # shared_cache: Optional[Dict[str, Any]] = None
+
+    # Per-file memo of get_output_path results: several components request
+    # the same handful of (suffix, prefix) pairs for every file, and
+    # output_dir/current_base_filename are fixed between set_current_file
+    # calls, so each path only needs formatting once. Cleared on file change.
+    # init=False so dataclasses.replace() gives every clone a fresh memo
+    # rather than sharing the base context's dict.
+    _path_cache: Dict[Tuple[str, Optional[str]], str] = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
-    class Config:
-        # Pydantic config: allow arbitrary types for logger instance
-        arbitrary_types_allowed = True
+    # str form of output_dir, resolved once: get_output_path joins plain
+    # strings instead of allocating a PurePath per call (callers only open
+    # or log the result, so nothing downstream needs a Path).
+    _output_dir_str: str = dataclasses.field(
+        default="", init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self._output_dir_str = os.fspath(self.output_dir)
+
+    # Base contexts per configuration tuple: cloning one of these is cheaper
+    # than constructing from scratch for every file.
+    _base_cache: ClassVar[Dict[Tuple[str, bool, bool], "WorkflowContext"]] = {}
+
+    @classmethod
+    def for_file(
+        cls,
+        output_dir: Union[str, Path],
+        logger: Any,
+        filepath: Union[str, Path],
+        skip_pdf_generation: bool = False,
+        force_overwrite: bool = False,
+    ) -> "WorkflowContext":
+        """
+        Returns a context set up for one file. The shared base context for
+        the (output_dir, flags) combination is built once and cached;
+        per-file contexts are shallow copies of it.
+        """
+        key = (str(output_dir), skip_pdf_generation, force_overwrite)
+        base = cls._base_cache.get(key)
+        if base is None:
+            base = cls(
+                output_dir=Path(output_dir),
+                logger=logger,
+                skip_pdf_generation=skip_pdf_generation,
+                force_overwrite=force_overwrite,
+            )
+            cls._base_cache[key] = base
+        context = dataclasses.replace(base, logger=logger)
+        context.set_current_file(Path(filepath))
+        return context
 
-    def get_output_path(self, suffix: str, prefix: Optional[str] = None) -> Path:
+    def get_output_path(self, suffix: str, prefix: Optional[str] = None) -> str:
         """
-        Generates a standardized output path within the context's output_dir
-        for the current file, using a given suffix.
+        Generates a standardized output path (as a string) within the
+        context's output_dir for the current file, using a given suffix.
         """
+        key = (suffix, prefix)
+        path = self._path_cache.get(key)
+        if path is not None:
+            return path
+
         if not self.current_base_filename:
             raise ValueError(
                 "current_base_filename must be set in context to generate output paths."
             )
 
         filename = f"{prefix or ''}{self.current_base_filename}{suffix}"
-        return self.output_dir / filename
+        path = os.path.join(self._output_dir_str, filename)
+        self._path_cache[key] = path
+        return path
 
     def set_current_file(self, filepath: Path):
         """Updates context with the current file being processed."""
         self.current_input_filepath = filepath.resolve()
         self.current_base_filename = filepath.stem
+        self._path_cache.clear()
         self.logger.debug(f"Context updated for file: {self.current_input_filepath}")
 
 
@@ -69,12 +130,12 @@ class WorkflowContext(BaseModel):
 #
 #     # Create context
 #     ctx = WorkflowContext(output_dir=Path("/tmp/metadata_outputs"), logger=dummy_logger)
-#     print(f"Initial context: {ctx.model_dump_json(indent=2)}")
+#     print(f"Initial context: {ctx}")
 #
 #     # Simulate processing a file
 #     dummy_file = Path("/path/to/my_image.tiff")
 #     ctx.set_current_file(dummy_file)
-#     print(f"Context after setting file: {ctx.model_dump_json(indent=2)}")
+#     print(f"Context after setting file: {ctx}")
 #
 #     # Get output paths
 #     raw_json_path = ctx.get_output_path("_raw_metadata.json")
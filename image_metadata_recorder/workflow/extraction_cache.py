@@ -0,0 +1,132 @@
+# image_metadata_recorder/workflow/extraction_cache.py
+
+"""
+Persistent on-disk cache for extracted raw metadata.
+
+Extraction is a pure function of the image file's contents, yet it was
+re-run on every CLI invocation even when only reporting options changed
+between runs. Entries are keyed by (absolute path, mtime_ns, size), so any
+change to the source file invalidates its entry automatically. The cache
+lives in the system temp directory by default and can be relocated with the
+IMR_CACHE_DIR environment variable or disabled per run via the CLI's
+--no-cache flag. store() bounds the cache at MAX_CACHE_ENTRIES by pruning
+the oldest entries, so superseded entries (every edit of a source file
+orphans its old keyed entry) cannot accumulate without limit.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    # Optional fast JSON serializer, mirroring the workflow module.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV_VAR = "IMR_CACHE_DIR"
+
+# Upper bound on cached entries. Keys include the source file's mtime, so an
+# edited file leaves its old entry behind forever; pruning the oldest entries
+# past this count keeps the cache from growing without bound while still
+# covering typical batch sizes.
+MAX_CACHE_ENTRIES = 256
+
+
+def get_cache_dir() -> Path:
+    """Returns the cache directory, honouring the IMR_CACHE_DIR override."""
+    override = os.environ.get(CACHE_DIR_ENV_VAR)
+    if override:
+        return Path(override)
+    return Path(tempfile.gettempdir()) / "image_metadata_recorder_cache"
+
+
+def _cache_key(filepath_str: str) -> Optional[str]:
+    """
+    Computes the cache key for a file from its path, mtime and size.
+    Returns None when the file cannot be stat'ed.
+    """
+    try:
+        st = os.stat(filepath_str)
+    except OSError:
+        return None
+    fingerprint = f"{filepath_str}|{st.st_mtime_ns}|{st.st_size}"
+    return hashlib.blake2b(fingerprint.encode("utf-8")).hexdigest()
+
+
+def load(filepath_str: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the cached raw metadata for the given file, or None on a miss
+    (including any unreadable or corrupt cache entry - the cache is purely
+    an optimization, so failures only mean re-extraction).
+    """
+    key = _cache_key(filepath_str)
+    if key is None:
+        return None
+    entry_path = get_cache_dir() / f"{key}.json"
+    try:
+        raw_bytes = entry_path.read_bytes()
+    except OSError:
+        return None
+    try:
+        if orjson is not None:
+            return orjson.loads(raw_bytes)
+        return json.loads(raw_bytes)
+    except ValueError:
+        logger.debug(f"Discarding corrupt cache entry: {entry_path}")
+        return None
+
+
+def _prune(cache_dir: Path) -> None:
+    """
+    Deletes the oldest cache entries (by entry mtime, i.e. least recently
+    written) once the cache exceeds MAX_CACHE_ENTRIES. Failures are ignored
+    entry by entry: a concurrent worker may have already removed a victim.
+    """
+    try:
+        with os.scandir(cache_dir) as dir_entries:
+            entries = [e for e in dir_entries if e.name.endswith(".json")]
+        excess = len(entries) - MAX_CACHE_ENTRIES
+        if excess <= 0:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime_ns)
+        for victim in entries[:excess]:
+            try:
+                os.unlink(victim.path)
+            except OSError:
+                pass
+        logger.debug(f"Pruned {excess} old cache entries from {cache_dir}")
+    except OSError as e:
+        logger.debug(f"Failed to prune cache directory {cache_dir}: {e}")
+
+
+def store(filepath_str: str, raw_metadata: Dict[str, Any]) -> None:
+    """
+    Saves extracted raw metadata for the given file. Failures are logged at
+    debug level and otherwise ignored - a missing cache entry only costs a
+    re-extraction on the next run.
+    """
+    key = _cache_key(filepath_str)
+    if key is None:
+        return
+    cache_dir = get_cache_dir()
+    entry_path = cache_dir / f"{key}.json"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        if orjson is not None:
+            payload = orjson.dumps(raw_metadata, default=str)
+        else:
+            payload = json.dumps(raw_metadata, default=str).encode("utf-8")
+        # Write-then-rename so concurrent workers never read a partial entry.
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, entry_path)
+        _prune(cache_dir)
+    except OSError as e:
+        logger.debug(f"Failed to write cache entry {entry_path}: {e}")